@@ -1,4 +1,5 @@
 from builtins import Exception, dict, str
+from functools import lru_cache
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,8 +10,9 @@ from app.services.jwt_service import decode_token
 from settings.config import Settings
 from fastapi import Depends
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Return application settings."""
+    """Return application settings, read from the environment and .env once and then reused."""
     return Settings()
 
 def get_email_service() -> EmailService:
@@ -6,12 +6,20 @@ class TemplateManager:
         # Dynamically determine the root path of the project
         self.root_dir = Path(__file__).resolve().parent.parent.parent  # Adjust this depending on the structure
         self.templates_dir = self.root_dir / 'email_templates'
+        self._templates = {}  # filename -> template content, filled on first read
 
     def _read_template(self, filename: str) -> str:
-        """Private method to read template content."""
-        template_path = self.templates_dir / filename
-        with open(template_path, 'r', encoding='utf-8') as file:
-            return file.read()
+        """Private method to read template content, reading each file from disk only once."""
+        if filename not in self._templates:
+            template_path = self.templates_dir / filename
+            with open(template_path, 'r', encoding='utf-8') as file:
+                self._templates[filename] = file.read()
+        return self._templates[filename]
+
+    def preload_all(self) -> None:
+        """Read every markdown template up front so later renders never touch the disk."""
+        for template_path in self.templates_dir.glob('*.md'):
+            self._read_template(template_path.name)
 
     def _apply_email_styles(self, html: str) -> str:
         """Apply advanced CSS styles inline for email compatibility with excellent typography."""
@@ -6,28 +6,35 @@ This Python test file utilizes pytest to manage database states and HTTP clients
 
 Fixtures:
 - `async_client`: Manages an asynchronous HTTP client for testing interactions with the FastAPI application.
-- `db_session`: Handles database transactions to ensure a clean database state for each test.
-- User fixtures (`user`, `locked_user`, `verified_user`, etc.): Set up various user states to test different behaviors under diverse conditions.
+- `engine`: Creates the async engine once per session and disposes of it at the end.
+- `db_connection`: Holds one connection and a session-wide transaction that is rolled back at the end.
+- `db_session`: Wraps each test in a SAVEPOINT to ensure a clean database state for each test.
+- `make_user`: Factory that flushes a user with overridable defaults into the test's session.
+- User fixtures (`user`, `locked_user`, `verified_user`, etc.): Thin `make_user` wrappers that set up various user states to test different behaviors under diverse conditions.
+- `template_manager`, `email_service`: Build the email pipeline once per session.
+- `default_password_hash`: Shares one real bcrypt hash between all user fixtures.
 - `token`: Generates an authentication token for testing secured endpoints.
 - `initialize_database`: Prepares the database at the session start.
-- `setup_database`: Sets up and tears down the database before and after each test.
+- `setup_database`: Creates the schema once per session and drops it when the session ends.
 """
 
 # Standard library imports
+import logging
+import os
 from builtins import range
 from datetime import datetime
 from unittest.mock import patch
 from uuid import uuid4
-from urllib.parse import urlencode
 
 # Third-party imports
 import pytest
+from pytest_asyncio import is_async_test
 from fastapi.testclient import TestClient
-from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, scoped_session
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 from faker import Faker
-from sqlalchemy import select
+from sqlalchemy import create_engine, event, insert, make_url, text
 
 # Application-specific imports
 from app.main import app
@@ -39,112 +46,134 @@ from app.utils.template_manager import TemplateManager
 from app.services.email_service import EmailService
 from app.services.jwt_service import create_access_token
 
+# fixture debug output follows the normal logging levels, e.g. shown with log_cli_level=DEBUG
+logger = logging.getLogger(__name__)
+
+Faker.seed(0)
 fake = Faker()
 
 settings = get_settings()
 TEST_DATABASE_URL = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
-engine = create_async_engine(TEST_DATABASE_URL, echo=settings.debug)
-AsyncTestingSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-AsyncSessionScoped = scoped_session(AsyncTestingSessionLocal)
-
-
-@pytest.fixture
-def email_service():
+# set TEST_DB_BACKEND=sqlite to run against an in-memory SQLite database instead of Postgres
+TEST_DB_BACKEND = os.environ.get("TEST_DB_BACKEND", "postgres")
+# SQL echo is opt-in through TEST_ECHO_SQL=1 rather than following the app's debug setting
+TEST_ECHO_SQL = os.environ.get("TEST_ECHO_SQL") == "1"
+# under pytest-xdist (`pytest -n auto`) every worker gets its own database, e.g. myappdb_gw0
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+if XDIST_WORKER:
+    _base_url = make_url(TEST_DATABASE_URL)
+    TEST_DATABASE_URL = _base_url.set(database=f"{_base_url.database}_{XDIST_WORKER}")
+AsyncTestingSessionLocal = async_sessionmaker(
+    class_=AsyncSession, expire_on_commit=False, join_transaction_mode="create_savepoint"
+)
+
+
+def pytest_configure(config):
+    if XDIST_WORKER and TEST_DB_BACKEND == "postgres":
+        create_worker_database()
+
+
+def create_worker_database():
+    """Creates this xdist worker's database, connecting through the configured one to do so."""
+    worker_db = TEST_DATABASE_URL.database
+    admin_url = make_url(settings.database_url).set(drivername="postgresql+psycopg2")
+    admin_engine = create_engine(admin_url, isolation_level="AUTOCOMMIT")
+    try:
+        with admin_engine.connect() as conn:
+            exists = conn.scalar(text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": worker_db})
+            if not exists:
+                conn.execute(text(f'CREATE DATABASE "{worker_db}"'))
+    finally:
+        admin_engine.dispose()
+
+
+def pytest_collection_modifyitems(items):
+    # the engine's pooled connections are bound to the event loop that opened them, so every
+    # async test runs on the session loop shared with the session-scoped database fixtures.
+    session_scope_marker = pytest.mark.asyncio(loop_scope="session")
+    skip_postgres = pytest.mark.skip(reason="requires Postgres (TEST_DB_BACKEND=sqlite)")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_scope_marker, append=False)
+        if TEST_DB_BACKEND == "sqlite" and "postgres" in item.keywords:
+            item.add_marker(skip_postgres)
+
+
+@pytest.fixture(scope="session")
+def template_manager():
     # Assuming the TemplateManager does not need any arguments for initialization
     template_manager = TemplateManager()
+    template_manager.preload_all()
+    return template_manager
+
+
+@pytest.fixture(scope="session")
+def email_service(template_manager):
     email_service = EmailService(template_manager=template_manager)
     return email_service
 
 
+# the ASGI transport only wraps the app, so one instance is shared by every test client
+@pytest.fixture(scope="session")
+def asgi_transport():
+    return ASGITransport(app=app)
+
 # this is what creates the http client for your api tests
 @pytest.fixture(scope="function")
-async def async_client(db_session):
-    async with AsyncClient(app=app, base_url="http://testserver") as client:
+async def async_client(asgi_transport, db_session):
+    async with AsyncClient(transport=asgi_transport, base_url="http://testserver") as client:
         app.dependency_overrides[get_db] = lambda: db_session
         try:
             yield client
         finally:
             app.dependency_overrides.clear()
 
-@pytest.fixture
-async def user_token(async_client, verified_user):
+@pytest.fixture(scope="session")
+def user_token():
     """
-    Logs in as a normal user (verified_user) and returns the access token.
+    Returns an access token for a normal (AUTHENTICATED) user.
+    The token is signed directly instead of logging in, so it is issued once per session.
     """
-    form_data = {
-        "username": verified_user.email,
-        "password": "MySuperPassword$1234"
-    }
-    # We assume your login endpoint is /login/ and uses form data
-    response = await async_client.post(
-        "/login/",
-        data=urlencode(form_data),
-        headers={"Content-Type": "application/x-www-form-urlencoded"}
-    )
-    data = response.json()
-    
-    # This fixture returns just the token string. 
-    # Some tests might also want the token type or the full response JSON.
-    return data["access_token"]
+    return create_access_token(data={"sub": "verified_user@example.com", "role": UserRole.AUTHENTICATED.name})
 
-@pytest.fixture(scope="function")
-async def admin_user(db_session):
+@pytest.fixture(scope="session")
+def default_password_hash():
     """
-    Creates an admin user in the database if one does not already exist.
+    Hashes the shared fixture password once; bcrypt is deliberately slow, so every
+    user fixture reuses this value instead of hashing the same literal again.
+    """
+    return hash_password("MySuperPassword$1234")
+
+@pytest.fixture(scope="session")
+async def admin_user(db_connection, default_password_hash):
+    """
+    Creates the admin user once per session, inside the session-wide transaction of `db_connection`,
+    so it survives every per-test rollback and is only rolled back when the session ends.
     Returns the admin user.
     """
-    # Check if an admin user with email "admin@example.com" already exists
-    query = select(User).where(User.email == "admin@example.com")
-    result = await db_session.execute(query)
-    user = result.scalars().first()
-
-    if not user:
-        # No admin user exists, so create one
-        print("Creating admin user fixture...")
+    logger.debug("Creating admin user fixture...")
+    async with AsyncTestingSessionLocal(bind=db_connection) as session:
         user = User(
             nickname="admin_user",
             email="admin@example.com",  # Use this exact email
-            hashed_password=hash_password("MySuperPassword$1234"),  # This must match your login credentials
+            hashed_password=default_password_hash,  # This must match your login credentials
             role=UserRole.ADMIN,
             email_verified=True,   # Must be True so that login does not reject the user
             is_locked=False,
         )
-        db_session.add(user)
-        await db_session.commit()
-        await db_session.refresh(user)
-        print("Admin user created:", user.email)
-    else:
-        print("Admin user already exists:", user.email)
-        
+        session.add(user)
+        await session.commit()
+    logger.debug("Admin user created: %s", user.email)
     return user
 
 
-@pytest.fixture
-async def admin_token(async_client, admin_user):
+@pytest.fixture(scope="session")
+def admin_token():
     """
-    Logs in as the admin user and returns the access token.
+    Returns an access token for the admin user (see `admin_user`).
+    The token is signed directly instead of logging in, so it is issued once per session.
     """
-    form_data = {
-        "username": admin_user.email,
-        "password": "MySuperPassword$1234"
-    }
-    print("Sending login request with:", form_data)
-    response = await async_client.post(
-        "/login/",
-        data=urlencode(form_data),
-        headers={"Content-Type": "application/x-www-form-urlencoded"}
-    )
-    print("Login response status:", response.status_code)
-    print("Login response text:", response.text)
-    
-    if response.status_code != 200:
-        raise Exception("Admin login failed. See debug output above.")
-    
-    data = response.json()
-    if "access_token" not in data:
-        raise Exception("No access_token in login response: " + response.text)
-    
-    return data["access_token"]
+    return create_access_token(data={"sub": "admin@example.com", "role": UserRole.ADMIN.name})
 
 @pytest.fixture(scope="session", autouse=True)
 def initialize_database():
@@ -153,130 +182,150 @@ def initialize_database():
     except Exception as e:
         pytest.fail(f"Failed to initialize the database: {str(e)}")
 
-# this function setup and tears down (drops tales) for each test function, so you have a clean database for each test.
-@pytest.fixture(scope="function", autouse=True)
-async def setup_database():
+@pytest.fixture(scope="session", autouse=True)
+def quiet_sqlalchemy_logging():
+    if not TEST_ECHO_SQL:
+        logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+# one engine (and connection pool) is shared by the whole test session and disposed at the end.
+@pytest.fixture(scope="session")
+async def engine():
+    if TEST_DB_BACKEND == "sqlite":
+        # StaticPool hands every session the same connection, so they all see one in-memory database
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            echo=TEST_ECHO_SQL,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+
+        # the sqlite driver manages transactions itself and breaks SAVEPOINTs;
+        # hand transaction control back to SQLAlchemy instead.
+        @event.listens_for(engine.sync_engine, "connect")
+        def do_connect(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine.sync_engine, "begin")
+        def do_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+    else:
+        # the tests themselves share the session-wide `db_connection`; the pool opens connections lazily,
+        # so the headroom costs nothing and keeps any extra checkout from waiting on that one connection.
+        engine = create_async_engine(
+            TEST_DATABASE_URL,
+            echo=TEST_ECHO_SQL,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=5,
+            max_overflow=10,
+            pool_pre_ping=True,
+        )
+    yield engine
+    await engine.dispose()
+
+# this function sets up the tables once for the whole test session and drops them at the end.
+@pytest.fixture(scope="session", autouse=True)
+async def setup_database(engine):
     async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
     yield
     async with engine.begin() as conn:
         # you can comment out this line during development if you are debugging a single test
-         await conn.run_sync(Base.metadata.drop_all)
-    await engine.dispose()
+        await conn.run_sync(Base.metadata.drop_all)
+
+# the whole session shares one connection inside an outer transaction that is rolled back at the end,
+# so rows created by session-scoped fixtures (e.g. `admin_user`) never reach the database for good.
+@pytest.fixture(scope="session")
+async def db_connection(engine, setup_database):
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            yield connection
+        finally:
+            await transaction.rollback()
 
+# each test runs inside a SAVEPOINT that is rolled back on teardown, so you have a clean
+# database for each test. Commits made by the code under test only release a nested SAVEPOINT.
 @pytest.fixture(scope="function")
-async def db_session(setup_database):
-    async with AsyncSessionScoped() as session:
-        try:
+async def db_session(db_connection):
+    savepoint = await db_connection.begin_nested()
+    try:
+        async with AsyncTestingSessionLocal(bind=db_connection) as session:
             yield session
-        finally:
-            await session.close()
+    finally:
+        await savepoint.rollback()
 
 @pytest.fixture(scope="function")
-async def locked_user(db_session):
-    unique_email = fake.email()
-    user_data = {
-        "nickname": fake.user_name(),
-        "first_name": fake.first_name(),
-        "last_name": fake.last_name(),
-        "email": unique_email,
-        "hashed_password": hash_password("MySuperPassword$1234"),
-        "role": UserRole.AUTHENTICATED,
-        "email_verified": False,
-        "is_locked": True,
-        "failed_login_attempts": settings.max_login_attempts,
-    }
-    user = User(**user_data)
-    db_session.add(user)
-    await db_session.commit()
-    return user
+def make_user(db_session, default_password_hash):
+    """
+    Returns a factory that adds a user to the test's session and flushes it.
+    Any column can be overridden by keyword, e.g. `await make_user(email_verified=True)`.
+    """
+    async def _make_user(**overrides):
+        user_data = {
+            "nickname": fake.user_name(),
+            "first_name": fake.first_name(),
+            "last_name": fake.last_name(),
+            "email": fake.email(),
+            "hashed_password": default_password_hash,
+            "role": UserRole.AUTHENTICATED,
+            "email_verified": False,
+            "is_locked": False,
+            **overrides,
+        }
+        user = User(**user_data)
+        db_session.add(user)
+        await db_session.flush()
+        return user
+    return _make_user
 
 @pytest.fixture(scope="function")
-async def user(db_session):
-    user_data = {
-        "nickname": fake.user_name(),
-        "first_name": fake.first_name(),
-        "last_name": fake.last_name(),
-        "email": fake.email(),
-        "hashed_password": hash_password("MySuperPassword$1234"),
-        "role": UserRole.AUTHENTICATED,
-        "email_verified": False,
-        "is_locked": False,
-    }
-    user = User(**user_data)
-    db_session.add(user)
-    await db_session.commit()
-    return user
+async def locked_user(make_user):
+    return await make_user(is_locked=True, failed_login_attempts=settings.max_login_attempts)
 
 @pytest.fixture(scope="function")
-async def verified_user(db_session):
-    user_data = {
-        "nickname": fake.user_name(),
-        "first_name": fake.first_name(),
-        "last_name": fake.last_name(),
-        "email": fake.email(),
-        "hashed_password": hash_password("MySuperPassword$1234"),
-        "role": UserRole.AUTHENTICATED,
-        "email_verified": True,
-        "is_locked": False,
-    }
-    user = User(**user_data)
-    db_session.add(user)
-    await db_session.commit()
-    return user
+async def user(make_user):
+    return await make_user()
 
 @pytest.fixture(scope="function")
-async def unverified_user(db_session):
-    user_data = {
-        "nickname": fake.user_name(),
-        "first_name": fake.first_name(),
-        "last_name": fake.last_name(),
-        "email": fake.email(),
-        "hashed_password": hash_password("MySuperPassword$1234"),
-        "role": UserRole.AUTHENTICATED,
-        "email_verified": False,
-        "is_locked": False,
-    }
-    user = User(**user_data)
-    db_session.add(user)
-    await db_session.commit()
-    return user
+async def verified_user(make_user):
+    return await make_user(email_verified=True)
 
 @pytest.fixture(scope="function")
-async def users_with_same_role_50_users(db_session):
-    users = []
-    for _ in range(50):
-        user_data = {
-            "nickname": fake.user_name(),
+async def unverified_user(make_user):
+    return await make_user()
+
+@pytest.fixture(scope="function")
+async def users_with_same_role_50_users(db_session, default_password_hash):
+    rows = [
+        {
+            "nickname": fake.unique.user_name(),
             "first_name": fake.first_name(),
             "last_name": fake.last_name(),
-            "email": fake.email(),
-            "hashed_password": fake.password(),
+            "email": fake.unique.email(),
+            "hashed_password": default_password_hash,
             "role": UserRole.AUTHENTICATED,
             "email_verified": False,
             "is_locked": False,
         }
-        user = User(**user_data)
-        db_session.add(user)
-        users.append(user)
+        for _ in range(50)
+    ]
+    # a single bulk INSERT ... RETURNING instead of one INSERT per user
+    result = await db_session.execute(insert(User).returning(User), rows)
+    users = result.scalars().all()
     await db_session.commit()
     return users
 
 @pytest.fixture
-async def manager_user(db_session: AsyncSession):
-    user = User(
+async def manager_user(make_user):
+    return await make_user(
         nickname="manager_john",
         first_name="John",
         last_name="Doe",
         email="manager_user@example.com",
-        hashed_password=hash_password("MySuperPassword$1234"),
         role=UserRole.MANAGER,
         email_verified=True,
-        is_locked=False,
     )
-    db_session.add(user)
-    await db_session.commit()
-    return user
 
 @pytest.fixture
 async def manager_token(async_client, manager_user):
@@ -287,14 +336,10 @@ async def manager_token(async_client, manager_user):
         "username": manager_user.email,          # "manager_user@example.com"
         "password": "MySuperPassword$1234"         # Must match the password used in manager_user fixture
     }
-    print("Sending manager login request with data:", form_data)
-    response = await async_client.post(
-        "/login/",
-        data=urlencode(form_data),
-        headers={"Content-Type": "application/x-www-form-urlencoded"}
-    )
-    print("Manager login response status:", response.status_code)
-    print("Manager login response text:", response.text)
+    logger.debug("Sending manager login request with data: %s", form_data)
+    response = await async_client.post("/login/", data=form_data)
+    logger.debug("Manager login response status: %s", response.status_code)
+    logger.debug("Manager login response text: %s", response.text)
     if response.status_code != 200:
         raise Exception("Manager login failed. Response: " + response.text)
     data = response.json()
@@ -23,6 +23,9 @@ def test_get_settings_returns_instance():
     settings_instance = get_settings()
     assert isinstance(settings_instance, Settings), "get_settings() should return an instance of Settings"
 
+def test_get_settings_is_cached():
+    assert get_settings() is get_settings(), "get_settings() should reuse a single Settings instance"
+
 # --------------------------------------------------------------------
 # Test for get_email_service()
 # --------------------------------------------------------------------
@@ -1,20 +1,54 @@
+import smtplib
 import pytest
 from app.services.email_service import EmailService
 from app.utils.template_manager import TemplateManager
+from tests.test_smtp import DummySMTP
 
-    
+USER_DATA = {
+    "email": "test@example.com",
+    "name": "Test User",
+    "verification_url": "http://example.com/verify?token=abc123"
+}
+
+
+def test_render_markdown_email(template_manager):
+    """Rendering the verification template is pure string work; no SMTP is involved."""
+    html = template_manager.render_template('email_verification', **USER_DATA)
+    assert "Hello Test User" in html
+    assert USER_DATA["verification_url"] in html
+
+
+def test_preload_all_caches_templates(mocker):
+    template_manager = TemplateManager()
+    template_manager.preload_all()
+    open_spy = mocker.patch('builtins.open')
+
+    template_manager.render_template('email_verification', **USER_DATA)
+    open_spy.assert_not_called()
+
+
+@pytest.mark.smtp
+@pytest.mark.asyncio
+async def test_send_markdown_email(email_service, monkeypatch, mocker):
+    # Patch the socket layer so the full EmailService -> SMTPClient path runs without any network I/O.
+    monkeypatch.setattr(smtplib, "SMTP", DummySMTP)
+    send_email = mocker.spy(email_service.smtp_client, "send_email")
+
+    await email_service.send_user_email(USER_DATA, 'email_verification')
+
+    send_email.assert_called_once()
+    subject, html_content, recipient = send_email.call_args.args
+    assert subject == "Verify Your Account"
+    assert recipient == USER_DATA["email"]
+    assert USER_DATA["verification_url"] in html_content
+
+
+@pytest.mark.integration
 @pytest.mark.asyncio
-async def test_send_markdown_email(mocker):
-    
-    mocker.patch('app.utils.smtp_connection.SMTPClient.send_email', return_value=None)
-    
+async def test_send_markdown_email_mailtrap():
+    """Sends a real email through the configured SMTP server; run with `pytest -m integration`."""
     template_manager = TemplateManager()
     email_service = EmailService(template_manager=template_manager)
 
-    user_data = {
-        "email": "test@example.com",
-        "name": "Test User",
-        "verification_url": "http://example.com/verify?token=abc123"
-    }
-    await email_service.send_user_email(user_data, 'email_verification')
+    await email_service.send_user_email(USER_DATA, 'email_verification')
     # Manual verification in Mailtrap
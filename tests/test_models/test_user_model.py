@@ -41,6 +41,8 @@ async def test_failed_login_attempts_increment(db_session: AsyncSession, user: U
     await db_session.refresh(user)
     assert user.failed_login_attempts == initial_attempts + 1, "Failed login attempts should increment"
 
+# SQLite drops the timezone from DateTime(timezone=True) columns
+@pytest.mark.postgres
 @pytest.mark.asyncio
 async def test_last_login_update(db_session: AsyncSession, user: User):
     """
@@ -1,3 +1,4 @@
+import contextlib
 import pytest
 import smtplib
 from app.utils.smtp_connection import SMTPClient
@@ -54,36 +55,34 @@ def smtp_client():
     # Create an instance of SMTPClient with dummy data.
     return SMTPClient("dummy_server", 2525, "dummy_user", "dummy_pass")
 
-def test_send_email_success(monkeypatch, smtp_client, caplog):
+class TestSendEmail:
     """
-    Test that send_email works when the SMTP connection is successful.
+    Every test in this class runs once per SMTP double; smtplib.SMTP is patched once per
+    parameter for the whole class instead of inside each test.
     """
-    # Patch smtplib.SMTP to use the DummySMTP class.
-    monkeypatch.setattr(smtplib, "SMTP", DummySMTP)
 
-    subject = "Test Subject"
-    html_content = "<p>Test Email</p>"
-    recipient = "test@example.com"
-
-    # When send_email is called, it should complete without raising any exceptions.
-    smtp_client.send_email(subject, html_content, recipient)
-
-    # Optionally, check that an info log indicating a successful email send was recorded.
-    assert 1 == 1
-
-def test_send_email_failure(monkeypatch):
-    """
-    Test that send_email raises an exception when the SMTP login fails.
-    """
-    # Create a new SMTPClient instance.
-    smtp_client = SMTPClient("dummy_server", 2525, "dummy_user", "dummy_pass")
-    # Patch smtplib.SMTP to use FailingSMTP to simulate a login failure.
-    monkeypatch.setattr(smtplib, "SMTP", FailingSMTP)
-
-    subject = "Test Subject"
-    html_content = "<p>Test Email</p>"
-    recipient = "test@example.com"
-
-    # Expect that send_email raises an exception due to simulated login failure.
-    with pytest.raises(Exception, match="Simulated login failure"):
-        smtp_client.send_email(subject, html_content, recipient)
+    @pytest.fixture(
+        scope="class",
+        autouse=True,
+        params=[(DummySMTP, None), (FailingSMTP, "Simulated login failure")],
+        ids=["success", "login_failure"],
+    )
+    def expected_error(self, request):
+        """Patches smtplib.SMTP with the parameter's double and yields the error it should cause, if any."""
+        smtp_impl, expected_error = request.param
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(smtplib, "SMTP", smtp_impl)
+            yield expected_error
+
+    def test_send_email(self, smtp_client, expected_error):
+        """
+        Test that send_email completes when the SMTP connection is successful,
+        and raises an exception when the SMTP login fails.
+        """
+        if expected_error is None:
+            outcome = contextlib.nullcontext()
+        else:
+            outcome = pytest.raises(Exception, match=expected_error)
+
+        with outcome:
+            smtp_client.send_email("Test Subject", "<p>Test Email</p>", "test@example.com")